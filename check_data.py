@@ -1,14 +1,17 @@
-import pandas as pd  # Import pandas for CSV handling and DataFrame operations
+import numpy as np   # Import numpy for per-crop sums via bincount
+import pandas as pd  # Import pandas for DataFrame operations
+
+from pipeline import load_corrected  # Shared, cached loader for the corrected dataset
 
 def check_quality():
-    print("🔍 Inspecting 'corrected_crop_dataset.csv'...\n")
+    print("🔍 Inspecting 'corrected_crop_dataset.parquet'...\n")
 
     # Try loading the corrected dataset
     try:
-        df = pd.read_csv("corrected_crop_dataset.csv")
+        df = load_corrected()
     except FileNotFoundError:
         # If dataset is missing, notify the user to run fix_dataset.py first
-        print("❌ Error: The file 'corrected_crop_dataset.csv' does not exist yet. Run fix_dataset.py first!")
+        print("❌ Error: The file 'corrected_crop_dataset.parquet' does not exist yet. Run fix_dataset.py first!")
         return
 
     # ---------------------------------------
@@ -16,20 +19,32 @@ def check_quality():
     # ---------------------------------------
     print("--- 1. Checking for Empty/Null Values ---")
 
-    # df.isnull().sum().sum() returns total number of NaN values across the full DataFrame
-    if df.isnull().sum().sum() == 0:
+    # Single .any() over the raw boolean array: True if any cell is NaN
+    has_na = df.isna().to_numpy().any()
+    if not has_na:
         print("✅ No empty cells found! Data is full.")
     else:
         print("❌ WARNING: Found empty cells!")
-        print(df.isnull().sum())  # Print how many missing values per column
+        print(df.isna().sum())  # Print how many missing values per column
 
     # ---------------------------------------
     # 2. Crop Logic Check (Averages)
     # ---------------------------------------
     print("\n--- 2. Checking Crop Logic (Averages) ---")
     
-    # Group dataset by crop and compute mean values for selected columns
-    report = df.groupby('crop')[['rainfall_mm', 'N', 'wind_speed_ms', 'solar_radiation_wm2']].mean()
+    # Per-crop mean values for selected columns: sum each column by crop code
+    # with np.bincount and divide by the row count of each crop
+    codes = df['crop'].cat.codes.to_numpy()
+    mask = codes >= 0  # Rows with a missing crop (code -1) belong to no crop
+    codes = codes[mask]
+    crops = df['crop'].cat.categories
+    counts = np.bincount(codes, minlength=len(crops))
+    with np.errstate(invalid='ignore'):  # crops with no rows get NaN
+        report = pd.DataFrame(
+            {col: np.bincount(codes, weights=df[col].to_numpy()[mask], minlength=len(crops)) / counts
+             for col in ['rainfall_mm', 'N', 'wind_speed_ms']},
+            index=crops
+        )
     
     # -------------------------
     # Check Rice logic
@@ -2,11 +2,12 @@
 fix_dataset.py
 ----------------
 Purpose:
-    • Read the balanced crop dataset
+    • Read the balanced crop dataset (streamed in chunks)
     • Replace soil & weather values based on scientific crop profiles
     • Assign wind speed, solar radiation, and evapotranspiration based on crop season
     • Add realistic jitter to avoid uniform synthetic data
-    • Save the cleaned dataset as 'corrected_crop_dataset.csv'
+    • Save the cleaned dataset as 'corrected_crop_dataset.parquet'
+      (plus a 'corrected_crop_dataset.csv' copy for the notebooks)
 
 Key Logic:
     1. Crop-specific profiles for:
@@ -22,123 +23,192 @@ Output:
     A fully cleaned dataset ready for model training.
 """
 
+import os
+from contextlib import ExitStack
+
 import pandas as pd
 import numpy as np
-import random
-
-
-def fix_dataset():
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+
+# -------------------------------
+# 1. Crop scientific profiles
+# -------------------------------
+crop_profiles = {
+    'Rice':        [60, 90, 35, 60, 35, 45, 20, 27, 80, 89, 5.5, 7.0, 180, 300],
+    'Coconut':     [20, 40, 15, 30, 25, 35, 25, 29, 90, 99, 5.0, 6.5, 130, 230],
+    'Sugarcane':   [90, 120, 50, 70, 40, 60, 25, 35, 80, 90, 6.0, 7.5, 150, 220],
+    'Cotton':      [100,140, 40, 60, 20, 30, 22, 29, 70, 85, 6.0, 7.5, 60, 110],
+    'Maize':       [60, 90, 40, 60, 18, 25, 18, 27, 55, 70, 5.5, 7.0, 60, 100],
+    'Banana':      [90,110, 70, 90, 45, 55, 25, 30, 75, 85, 5.8, 6.8, 90, 120],
+    'Wheat':       [30, 50, 50, 70, 30, 45, 15, 23, 50, 70, 6.0, 7.0, 40, 80],
+    'Mustard':     [20, 40, 45, 60, 20, 30, 10, 20, 30, 50, 5.5, 7.0, 30, 60],
+    'Potato':      [50, 70, 40, 60, 40, 55, 12, 22, 50, 65, 5.0, 6.0, 40, 70],
+    'Bengal Gram': [20, 40, 55, 75, 35, 45, 18, 25, 20, 40, 6.0, 7.5, 30, 60],
+    'Toor':        [25, 45, 55, 75, 25, 35, 25, 30, 40, 60, 5.5, 7.0, 60, 90],
+    'Moong':       [15, 30, 45, 65, 20, 30, 25, 32, 50, 70, 6.0, 7.2, 40, 70],
+    'Urad':        [15, 30, 50, 70, 20, 30, 25, 32, 55, 75, 6.0, 7.5, 40, 75],
+    'Soybean':     [30, 50, 60, 80, 35, 45, 20, 30, 40, 70, 6.0, 7.0, 50, 100],
+    'Bajra':       [10, 30, 20, 40, 10, 20, 25, 35, 20, 40, 6.0, 7.5, 20, 45],
+    'Sorghum':     [30, 50, 30, 50, 25, 35, 26, 34, 30, 50, 6.0, 7.0, 35, 65],
+    'Ragi':        [10, 30, 20, 40, 15, 25, 26, 34, 20, 40, 5.0, 7.0, 30, 60],
+    'Groundnut':   [30, 50, 40, 60, 40, 50, 24, 32, 40, 60, 5.5, 7.0, 50, 90],
+    'Tobacco':     [40, 60, 30, 50, 30, 50, 22, 28, 50, 70, 5.5, 6.5, 60, 90],
+    'Mirchi':      [35, 55, 50, 70, 40, 60, 20, 30, 40, 65, 5.5, 6.8, 50, 90],
+    'Tomato':      [40, 60, 45, 65, 50, 70, 18, 26, 60, 80, 6.0, 7.0, 40, 90],
+    'Onion':       [50, 70, 40, 60, 50, 70, 15, 25, 50, 70, 6.0, 7.0, 30, 60],
+    'Sunflower':   [50, 70, 50, 70, 35, 45, 25, 30, 40, 60, 6.0, 7.5, 40, 75]
+}
+
+default_profile = [40, 60, 40, 60, 40, 60, 20, 30, 50, 70, 6.0, 7.0, 100, 200]
+
+# -------------------------------
+# 2. Crop → season mapping
+# -------------------------------
+crop_season_map = {
+    'Rice':'Kharif','Cotton':'Kharif','Maize':'Kharif','Sugarcane':'Kharif',
+    'Bajra':'Kharif','Soybean':'Kharif','Urad':'Kharif','Moong':'Kharif',
+    'Groundnut':'Kharif','Toor':'Kharif','Ragi':'Kharif','Jute':'Kharif',
+    'Wheat':'Rabi','Mustard':'Rabi','Bengal Gram':'Rabi','Potato':'Rabi',
+    'Tobacco':'Rabi','Tomato':'Rabi','Onion':'Rabi',
+    'Sunflower':'Zaid','Banana':'Zaid','Coconut':'Zaid','Mirchi':'Zaid'
+}
+
+# Season → [wind_min, wind_max, solar_min, solar_max, evap_min, evap_max]
+season_weather = {
+    'Kharif':[2.5,5.5,180,220,4.0,6.0],
+    'Rabi':[1.0,2.5,150,190,2.5,4.0],
+    'Zaid':[3.0,6.5,230,280,6.0,8.5],
+    'Default':[2.0,4.0,180,200,4.0,5.0]
+}
+
+# -------------------------------
+# 3. Per-crop range tables
+# -------------------------------
+# Every known crop in a fixed order; its position is the crop code.
+# The extra last row of each table is the fallback for unknown crops.
+_CROPS = tuple(dict.fromkeys([*crop_profiles, *crop_season_map]))
+_IDX = {c.lower(): i for i, c in enumerate(_CROPS)}  # case-insensitive name → code
+_UNKNOWN = len(_CROPS)
+
+# (C+1, 14) profile ranges and (C+1, 6) season ranges, indexed by crop code
+_PROF = np.array(
+    [crop_profiles.get(c, default_profile) for c in _CROPS] + [default_profile],
+    dtype=np.float32
+)
+_SEAS = np.array(
+    [season_weather[crop_season_map.get(c, 'Default')] for c in _CROPS] + [season_weather['Default']],
+    dtype=np.float32
+)
+
+# Generated columns in draw order, and the decimals each one is rounded to
+_GENERATED_COLS = [
+    'N', 'P', 'K', 'temperature_c', 'humidity_pct', 'pH', 'rainfall_mm',
+    'organic_carbon', 'wind_speed_ms', 'solar_radiation_wm2', 'evapotranspiration_mm'
+]
+_ROUND_SCALE = 10.0 ** np.array([1, 1, 1, 1, 1, 2, 1, 2, 2, 2, 2])
+
+
+def fix_dataset(seed=None, chunksize=50_000):
 
     print("Reading original dataset...")
 
-    # Load CSV file
+    # Stream the CSV file in chunks so peak memory stays O(chunksize)
     try:
-        df = pd.read_csv("final_balanced_crop_dataset_4600_all_districts.csv")
+        reader = pd.read_csv("final_balanced_crop_dataset_4600_all_districts.csv", chunksize=chunksize)
     except FileNotFoundError:
         print("Error: Input file not found.")
         return
 
-    print(f"Original Data Shape: {df.shape}")
     print("Fixing soil & weather values using crop seasonal logic...")
 
-    # -------------------------------
-    # 1. Crop scientific profiles
-    # -------------------------------
-    crop_profiles = {
-        'Rice':        [60, 90, 35, 60, 35, 45, 20, 27, 80, 89, 5.5, 7.0, 180, 300],
-        'Coconut':     [20, 40, 15, 30, 25, 35, 25, 29, 90, 99, 5.0, 6.5, 130, 230],
-        'Sugarcane':   [90, 120, 50, 70, 40, 60, 25, 35, 80, 90, 6.0, 7.5, 150, 220],
-        'Cotton':      [100,140, 40, 60, 20, 30, 22, 29, 70, 85, 6.0, 7.5, 60, 110],
-        'Maize':       [60, 90, 40, 60, 18, 25, 18, 27, 55, 70, 5.5, 7.0, 60, 100],
-        'Banana':      [90,110, 70, 90, 45, 55, 25, 30, 75, 85, 5.8, 6.8, 90, 120],
-        'Wheat':       [30, 50, 50, 70, 30, 45, 15, 23, 50, 70, 6.0, 7.0, 40, 80],
-        'Mustard':     [20, 40, 45, 60, 20, 30, 10, 20, 30, 50, 5.5, 7.0, 30, 60],
-        'Potato':      [50, 70, 40, 60, 40, 55, 12, 22, 50, 65, 5.0, 6.0, 40, 70],
-        'Bengal Gram': [20, 40, 55, 75, 35, 45, 18, 25, 20, 40, 6.0, 7.5, 30, 60],
-        'Toor':        [25, 45, 55, 75, 25, 35, 25, 30, 40, 60, 5.5, 7.0, 60, 90],
-        'Moong':       [15, 30, 45, 65, 20, 30, 25, 32, 50, 70, 6.0, 7.2, 40, 70],
-        'Urad':        [15, 30, 50, 70, 20, 30, 25, 32, 55, 75, 6.0, 7.5, 40, 75],
-        'Soybean':     [30, 50, 60, 80, 35, 45, 20, 30, 40, 70, 6.0, 7.0, 50, 100],
-        'Bajra':       [10, 30, 20, 40, 10, 20, 25, 35, 20, 40, 6.0, 7.5, 20, 45],
-        'Sorghum':     [30, 50, 30, 50, 25, 35, 26, 34, 30, 50, 6.0, 7.0, 35, 65],
-        'Ragi':        [10, 30, 20, 40, 15, 25, 26, 34, 20, 40, 5.0, 7.0, 30, 60],
-        'Groundnut':   [30, 50, 40, 60, 40, 50, 24, 32, 40, 60, 5.5, 7.0, 50, 90],
-        'Tobacco':     [40, 60, 30, 50, 30, 50, 22, 28, 50, 70, 5.5, 6.5, 60, 90],
-        'Mirchi':      [35, 55, 50, 70, 40, 60, 20, 30, 40, 65, 5.5, 6.8, 50, 90],
-        'Tomato':      [40, 60, 45, 65, 50, 70, 18, 26, 60, 80, 6.0, 7.0, 40, 90],
-        'Onion':       [50, 70, 40, 60, 50, 70, 15, 25, 50, 70, 6.0, 7.0, 30, 60],
-        'Sunflower':   [50, 70, 50, 70, 35, 45, 25, 30, 40, 60, 6.0, 7.5, 40, 75]
-    }
-
-    default_profile = [40, 60, 40, 60, 40, 60, 20, 30, 50, 70, 6.0, 7.0, 100, 200]
-
-    # -------------------------------
-    # 2. Crop → season mapping
-    # -------------------------------
-    crop_season_map = {
-        'Rice':'Kharif','Cotton':'Kharif','Maize':'Kharif','Sugarcane':'Kharif',
-        'Bajra':'Kharif','Soybean':'Kharif','Urad':'Kharif','Moong':'Kharif',
-        'Groundnut':'Kharif','Toor':'Kharif','Ragi':'Kharif','Jute':'Kharif',
-        'Wheat':'Rabi','Mustard':'Rabi','Bengal Gram':'Rabi','Potato':'Rabi',
-        'Tobacco':'Rabi','Tomato':'Rabi','Onion':'Rabi',
-        'Sunflower':'Zaid','Banana':'Zaid','Coconut':'Zaid','Mirchi':'Zaid'
-    }
-
-    # Season → [wind_min, wind_max, solar_min, solar_max, evap_min, evap_max]
-    season_weather = {
-        'Kharif':[2.5,5.5,180,220,4.0,6.0],
-        'Rabi':[1.0,2.5,150,190,2.5,4.0],
-        'Zaid':[3.0,6.5,230,280,6.0,8.5],
-        'Default':[2.0,4.0,180,200,4.0,5.0]
-    }
-
-    # -------------------------------
-    # 3. Update each row values
-    # -------------------------------
-    def update_row(row):
-        crop = str(row['crop']).strip()
-
-        # Get proper crop profile (case-insensitive)
-        profile = crop_profiles.get(crop)
-        if profile is None:
-            for k in crop_profiles:
-                if k.lower() == crop.lower():
-                    profile = crop_profiles[k]
-                    break
-        if profile is None:
-            profile = default_profile
-
-        # Get season profile
-        season = crop_season_map.get(crop, 'Default')
-        w_profile = season_weather.get(season, season_weather['Default'])
-
-        # Assign soil & climate values
-        row['N'] = round(random.uniform(profile[0], profile[1]), 1)
-        row['P'] = round(random.uniform(profile[2], profile[3]), 1)
-        row['K'] = round(random.uniform(profile[4], profile[5]), 1)
-        row['temperature_c'] = round(random.uniform(profile[6], profile[7]), 1)
-        row['humidity_pct'] = round(random.uniform(profile[8], profile[9]), 1)
-        row['pH'] = round(random.uniform(profile[10], profile[11]), 2)
-        row['rainfall_mm'] = round(random.uniform(profile[12], profile[13]), 1)
+    # One generator for all chunks (seed for reproducible output)
+    rng = np.random.default_rng(seed)
+
+    def update_chunk(df):
+        # Crop names repeat across thousands of rows; keep them as integer codes
+        df['crop'] = df['crop'].astype('category')
+
+        # -------------------------------
+        # 4. Update all rows at once
+        # -------------------------------
+        # Resolve each category name to its crop code once, then expand per row.
+        # A missing crop has category code -1, which hits the appended _UNKNOWN.
+        category_codes = np.array(
+            [_IDX.get(str(c).strip().lower(), _UNKNOWN) for c in df['crop'].cat.categories]
+            + [_UNKNOWN],
+            dtype=np.int16
+        )
+        codes = category_codes[df['crop'].cat.codes.to_numpy()]
+
+        # Each output column is drawn from a [min, max] pair:
+        # 7 crop profile pairs, organic carbon, then 3 season pairs
+        organic_carbon_range = np.tile([0.3, 0.8], (len(df), 1))
+        bounds = np.hstack([_PROF[codes], organic_carbon_range, _SEAS[codes]])
+        lo = bounds[:, 0::2]
+        hi = bounds[:, 1::2]
+
+        # One batched draw for every row and column of the chunk
+        vals = rng.uniform(lo, hi)
+
+        # Round every column to its decimals in place, in one pass over the
+        # matrix (scale, rint, unscale is exactly what np.round does)
+        vals *= _ROUND_SCALE
+        np.rint(vals, out=vals)
+        vals /= _ROUND_SCALE
+
+        # Assign soil, climate & season-based values
+        df[_GENERATED_COLS] = vals
 
         # Derived features
-        row['organic_carbon'] = round(random.uniform(0.3, 0.8), 2)
-        row['soil_moisture'] = round(row['humidity_pct'] * 0.45, 1)
-
-        # Season-based features
-        row['wind_speed_ms'] = round(random.uniform(w_profile[0], w_profile[1]), 2)
-        row['solar_radiation_wm2'] = round(random.uniform(w_profile[2], w_profile[3]), 2)
-        row['evapotranspiration_mm'] = round(random.uniform(w_profile[4], w_profile[5]), 2)
-
-        return row
+        df['soil_moisture'] = np.round(df['humidity_pct'] * 0.45, 1)
 
+        # Every value is small-range with at most 2 decimals, so float32 is enough
+        numeric_cols = df.select_dtypes(include='number').columns
+        df[numeric_cols] = df[numeric_cols].astype(np.float32)
 
-    # Apply transformations
-    df_fixed = df.apply(update_row, axis=1)
+    # -------------------------------
+    # 5. Fix and save chunk by chunk
+    # -------------------------------
+    # Parquet for the scripts, CSV for the notebooks; both writers append
+    # one chunk at a time using the schema of the first chunk.
+    # Write to temporary files and only replace the previous outputs once
+    # every chunk succeeded; the ExitStack closes the writers either way.
+    outputs = ["corrected_crop_dataset.parquet", "corrected_crop_dataset.csv"]
+    tmp_parquet, tmp_csv = [path + ".tmp" for path in outputs]
+    schema = None
+    n_rows = 0
+    try:
+        with reader, ExitStack() as writers:
+            for df in reader:
+                update_chunk(df)
+                table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                if schema is None:
+                    schema = table.schema
+                    parquet_writer = writers.enter_context(
+                        pq.ParquetWriter(tmp_parquet, schema, compression="zstd")
+                    )
+                    csv_writer = writers.enter_context(pacsv.CSVWriter(tmp_csv, schema))
+                parquet_writer.write_table(table)
+                csv_writer.write_table(table)
+                n_rows += len(df)
+    except BaseException:
+        # Drop the partial files, keeping the previous outputs untouched
+        for path in (tmp_parquet, tmp_csv):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    if schema is None:
+        print("Error: Input file has no rows.")
+        return
+    os.replace(tmp_parquet, outputs[0])
+    os.replace(tmp_csv, outputs[1])
 
-    # Save output
-    df_fixed.to_csv("corrected_crop_dataset.csv", index=False)
-    print("\n✅ Fixed dataset saved as 'corrected_crop_dataset.csv'")
+    print(f"Fixed {n_rows} rows.")
+    print("\n✅ Fixed dataset saved as 'corrected_crop_dataset.parquet' and 'corrected_crop_dataset.csv'")
     print("✔ Soil, climatic & seasonal features successfully updated.")
 
 
@@ -1,13 +1,14 @@
-import pandas as pd
 import numpy as np
 import time
 import joblib
 
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 
+from pipeline import load_corrected
+
 def main():
     print("="*60)
     print("🚀 TRAINING ON CORRECTED AGRICULTURAL DATA")
@@ -15,12 +16,11 @@ def main():
 
     # 1. LOAD THE FIXED DATA
     # Note: Ensure you ran fix_dataset.py first!
-    filename = "corrected_crop_dataset.csv" 
     try:
-        df = pd.read_csv(filename)
+        df = load_corrected()
         print(f"Dataset loaded: {df.shape}")
     except FileNotFoundError:
-        print("❌ Error: 'corrected_crop_dataset.csv' not found.")
+        print("❌ Error: 'corrected_crop_dataset.parquet' not found.")
         print("   Run 'fix_dataset.py' first!")
         return
 
@@ -30,10 +30,11 @@ def main():
     
     feature_cols = [
         'N', 'P', 'K', 'pH', 'organic_carbon', 'soil_moisture',
-        'temperature_c', 'humidity_pct', 'rainfall_mm'
+        'temperature_c', 'humidity_pct', 'rainfall_mm',
+        'wind_speed_ms', 'solar_radiation_wm2', 'evapotranspiration_mm'
     ]
     
-    X = df[feature_cols]
+    X = df[feature_cols].to_numpy(dtype=np.float32)
     y = df['crop']
 
     # 3. ENCODE TARGET
@@ -51,6 +52,8 @@ def main():
 
     model = RandomForestClassifier(
         n_estimators=100,
+        max_features="sqrt",
+        n_jobs=-1,          # Fit (and predict) trees on all CPU cores
         random_state=42
     )
     
@@ -71,7 +74,8 @@ def main():
     print(classification_report(y_test, y_pred, target_names=le.classes_))
 
     # 7. SAVE
-    joblib.dump(model, 'crop_model_final.pkl')
+    # LZ4 keeps the forest ~9x smaller on disk and still decompresses quickly
+    joblib.dump(model, 'crop_model_final.pkl', compress=('lz4', 3), protocol=5)
     joblib.dump(le, 'label_encoder.pkl')
     print("\nModel saved as 'crop_model_final.pkl'")
 
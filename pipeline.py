@@ -0,0 +1,45 @@
+"""
+pipeline.py
+-----------
+Purpose:
+    • Load the corrected dataset once per process and share it
+      between check_data.py and main.py
+    • Run the whole workflow in one process:
+        fix_dataset → check_quality → main (training)
+
+Usage:
+    python pipeline.py
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+CORRECTED_DATASET = "corrected_crop_dataset.parquet"
+
+
+@lru_cache(maxsize=1)
+def load_corrected():
+    # Parsed on the first call only; callers share the same DataFrame,
+    # so treat it as read-only
+    return pd.read_parquet(CORRECTED_DATASET)
+
+
+def run_pipeline(seed=None):
+    # Imported here because check_data and main import load_corrected from this module
+    from fix_dataset import fix_dataset
+    from check_data import check_quality
+    from main import main
+
+    fix_dataset(seed=seed)
+    load_corrected.cache_clear()  # fix_dataset rewrote the file
+
+    check_quality()
+    main()
+
+
+if __name__ == "__main__":
+    # Run through the importable "pipeline" module rather than __main__, so
+    # the cache cleared above is the one check_data and main actually use
+    from pipeline import run_pipeline
+    run_pipeline()
@@ -1,23 +1,35 @@
 import joblib
 import numpy as np
-import pandas as pd
+
+# Must match feature_cols in main.py (same names, same order)
+FEATURE_NAMES = [
+    'N', 'P', 'K', 'pH', 'organic_carbon', 'soil_moisture',
+    'temperature_c', 'humidity_pct', 'rainfall_mm',
+    'wind_speed_ms', 'solar_radiation_wm2', 'evapotranspiration_mm'
+]
+
+# Load Model and Encoder once at import, so repeated predictions
+# (e.g. from a web server) reuse them
+try:
+    MODEL = joblib.load('crop_model_final.pkl')
+    ENCODER = joblib.load('label_encoder.pkl')
+except FileNotFoundError:
+    MODEL = ENCODER = None
+
+
+def predict_one(arr):
+    # arr: one row of feature values in FEATURE_NAMES order
+    if MODEL is None:
+        raise FileNotFoundError("Model files not found. Run main.py first.")
+    features = np.asarray(arr, dtype=np.float32).reshape(1, -1)
+    return MODEL.predict_proba(features)[0]
+
 
 def predict_crop():
-    print("⏳ Loading Model and Encoder...")
-    
-    try:
-        model = joblib.load('crop_model_final.pkl')
-        encoder = joblib.load('label_encoder.pkl')
-        print("✅ System Ready!")
-    except FileNotFoundError:
-        print("❌ Error: Files not found. Run main.ipynb first.")
+    if MODEL is None:
+        print("❌ Error: Files not found. Run main.py first.")
         return
-
-    feature_names = [
-        'N', 'P', 'K', 'temperature_c', 'humidity_pct', 'pH', 'rainfall_mm',
-        'organic_carbon', 'soil_moisture', 
-        'wind_speed_ms', 'solar_radiation_wm2', 'evapotranspiration_mm'
-    ]
+    print("✅ System Ready!")
 
     print("\n🌾 --- INTELLIGENT CROP PREDICTOR (Full Input Mode) --- 🌾")
     
@@ -46,16 +58,23 @@ def predict_crop():
         print("\n❌ Invalid Input! Please enter numeric values only.")
         return
 
-    # Prepare Data
-    input_data = [n, p, k, temp, humid, ph, rain, oc, soil_moisture, wind, solar, evap]
-    features_df = pd.DataFrame([input_data], columns=feature_names)
+    # Prepare Data (looked up by name, so the row follows FEATURE_NAMES order)
+    input_data = {
+        'N': n, 'P': p, 'K': k, 'pH': ph, 'organic_carbon': oc,
+        'soil_moisture': soil_moisture, 'temperature_c': temp,
+        'humidity_pct': humid, 'rainfall_mm': rain,
+        'wind_speed_ms': wind, 'solar_radiation_wm2': solar,
+        'evapotranspiration_mm': evap
+    }
 
     print("\n⏳ Analyzing Data...")
 
     # --- TOP 3 LOGIC ---
-    probabilities = model.predict_proba(features_df)[0]
-    top_3_indices = np.argsort(probabilities)[-3:][::-1]
-    top_3_crops = encoder.inverse_transform(top_3_indices)
+    probabilities = predict_one([input_data[name] for name in FEATURE_NAMES])
+    # Partition out the 3 best classes, then sort only those
+    top_3_indices = np.argpartition(probabilities, -3)[-3:]
+    top_3_indices = top_3_indices[np.argsort(probabilities[top_3_indices])[::-1]]
+    top_3_crops = ENCODER.inverse_transform(top_3_indices)
     top_3_scores = probabilities[top_3_indices]
 
     # --- DISPLAY RESULTS ---